@@ -11,10 +11,24 @@ create table if not exists seen_episodes (
   rss_guid text,
   spotify_episode_id text,
   published_at timestamptz,
-  first_seen_at timestamptz default now(),
-  constraint uq_seen unique (feed_url, coalesce(rss_guid, ''), coalesce(spotify_episode_id, ''))
+  first_seen_at timestamptz default now()
 );
 
+-- Dedupe via a single expression unique index (Postgres can't put
+-- coalesce() expressions in a UNIQUE table constraint). This matches the
+-- index the worker's ensure_schema() creates — keep them in sync so there
+-- is exactly one unique object to maintain per insert.
+create unique index if not exists uq_seen
+  on seen_episodes (feed_url, coalesce(rss_guid, ''), coalesce(spotify_episode_id, ''));
+
+-- Supports the worker's recency-bounded seen-cache prefetch
+create index if not exists idx_seen_first_seen_at
+  on seen_episodes (first_seen_at);
+
+-- Compressed transcript kept with the seen row so criteria changes can
+-- re-rank old videos without refetching captions from YouTube
+alter table seen_episodes add column if not exists transcript_zstd bytea;
+
 -- OAuth session for the bot (web service)
 create table if not exists oauth_sessions (
   did text primary key,
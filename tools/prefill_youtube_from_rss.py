@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 import os, sys, yaml, requests, time, re
 import feedparser
+from requests.adapters import HTTPAdapter
 
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "").strip()
 
+_NON_WORD = re.compile(r"\W+")
+
+# Reuse one pooled session across the many search calls
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def rss_title(url):
     d = feedparser.parse(url)
     return (d.feed.get("title") or "").strip()
@@ -19,17 +26,17 @@ def yt_search_channel(q):
         "maxResults": 3,
         "key": YOUTUBE_API_KEY,
     }
-    r = requests.get("https://www.googleapis.com/youtube/v3/search", params=params, timeout=20)
+    r = SESSION.get("https://www.googleapis.com/youtube/v3/search", params=params, timeout=20)
     r.raise_for_status()
     items = r.json().get("items", [])
     if not items:
         return None, None
     best = None
-    q_norm = re.sub(r"\W+", "", q).lower()
+    q_norm = _NON_WORD.sub("", q).lower()
     for it in items:
         title = it["snippet"]["title"]
         id_ = it["snippet"]["channelId"]
-        t_norm = re.sub(r"\W+", "", title).lower()
+        t_norm = _NON_WORD.sub("", title).lower()
         if q_norm and (q_norm in t_norm or t_norm in q_norm):
             return id_, title
         if best is None:
@@ -65,7 +72,7 @@ def main():
         sys.exit(1)
 
     with open(sys.argv[1], "r") as f:
-        cfg = yaml.safe_load(f)
+        cfg = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
     result = {
         "timezone": cfg.get("timezone", "America/Los_Angeles"),
@@ -77,7 +84,13 @@ def main():
         "blazers_feeds": convert_list(cfg.get("blazers_feeds", [])),
     }
 
-    yaml.safe_dump(result, sys.stdout, sort_keys=False, allow_unicode=True)
+    yaml.dump(
+        result,
+        sys.stdout,
+        Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+        sort_keys=False,
+        allow_unicode=True,
+    )
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,7 @@
 // web/server.js (ESM) - Bluesky OAuth + Posting API
 import express from 'express';
 import { Pool } from 'pg';
-import { randomUUID } from 'node:crypto';
+import { createHmac, randomUUID, timingSafeEqual } from 'node:crypto';
 import pkg from '@atproto/oauth-client-node';
 const { NodeOAuthClient } = pkg;
 import { JoseKey } from '@atproto/jwk-jose';
@@ -186,6 +186,42 @@ app.post('/post-thread', async (req, res, next) => {
   }
 });
 
+// ------------------------------
+// WebSub (YouTube push notifications)
+// ------------------------------
+// The hub verifies subscriptions with a GET carrying hub.challenge, then
+// delivers Atom XML POSTs when a channel uploads. We don't process the
+// document here — just pull the channelId out and pg_notify the worker,
+// which runs its normal channel processing on receipt.
+app.get('/websub/callback', (req, res) => {
+  const challenge = req.query['hub.challenge'];
+  if (!challenge) return res.status(400).send('missing hub.challenge');
+  res.type('text/plain').send(challenge);
+});
+
+app.post('/websub/callback', express.text({ type: '*/*', limit: '1mb' }), async (req, res, next) => {
+  try {
+    // The worker subscribes with hub.secret, so genuine notifications
+    // carry an HMAC of the body in X-Hub-Signature. Drop anything
+    // unsigned or mis-signed — otherwise arbitrary POSTs could drive
+    // worker fetch load. Per spec we still answer 2xx so the hub
+    // doesn't tear down the subscription over a transient mismatch.
+    const sig = Buffer.from(req.get('X-Hub-Signature') || '');
+    const expected = Buffer.from('sha1=' + createHmac('sha1', INTERNAL_API_TOKEN).update(req.body || '').digest('hex'));
+    if (sig.length !== expected.length || !timingSafeEqual(sig, expected)) {
+      console.warn('[websub] dropping notification with bad signature');
+      return res.status(204).end();
+    }
+    const m = /<yt:channelId>([^<]+)<\/yt:channelId>/.exec(req.body || '');
+    if (m) await pg.query(`SELECT pg_notify('websub_push', $1)`, [m[1]]);
+    // Always answer 2xx fast; the hub retries failures and will drop the
+    // subscription if the callback looks broken.
+    return res.status(204).end();
+  } catch (err) {
+    return next(err);
+  }
+});
+
 app.use((err, _req, res, _next) => {
   console.error('--- unhandled error ---');
   console.error(err);
@@ -1,9 +1,21 @@
-import os, time, re, json, math, hashlib
+import os, time, re, math, hashlib, threading, pickle, zlib, select
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import feedparser, requests, yaml
-from datetime import datetime
+import zstandard
+from lxml import etree
+import redis
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 from dateutil import parser as dtparse, tz
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import youtube_transcript_api as yta
 # YouTube transcripts
 try:
@@ -26,8 +38,15 @@ from youtube_transcript_api import (
     CouldNotRetrieveTranscript,
 )
 from google import genai
-from google.genai import types as gtypes
+from google.genai import errors as gerrors, types as gtypes
 from yt_dlp import YoutubeDL
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 # ---------------- Env ----------------
 DB_URL = os.environ["DATABASE_URL"]
@@ -52,7 +71,35 @@ UTC = tz.UTC
 YTDLP_COOKIES = os.getenv("YTDLP_COOKIES")  # optional: /app/cookies.txt (exported from your browser)
 YTDLP_EXTRACTOR_CLIENTS = [s.strip() for s in os.getenv("YTDLP_EXTRACTOR_CLIENTS", "android,web").split(",")]
 YTDLP_SLEEP_REQUESTS = float(os.getenv("YTDLP_SLEEP_REQUESTS", "1.0"))  # seconds between internal requests
-SCAN_PAUSE_SECONDS = float(os.getenv("SCAN_PAUSE_SECONDS", "0.7"))      # pause between channels to look less bot-like
+SCAN_PAUSE_SECONDS = float(os.getenv("SCAN_PAUSE_SECONDS", "0.7"))      # pause between channel submissions to look less bot-like
+FEED_WORKERS = int(os.getenv("FEED_WORKERS", "8"))  # concurrent channels per poll cycle
+# Opt-in: skip the transcript fetch for national videos whose RSS
+# title/description never mention a keyword. Off by default — national
+# shows routinely bury Blazers segments in generically-titled episodes,
+# and surfacing those is the point of national mode, so trade recall
+# for bandwidth only when explicitly asked.
+NATIONAL_TITLE_PRECHECK = os.getenv("NATIONAL_TITLE_PRECHECK", "0") == "1"
+# Seen-row lifecycle: only recent rows are prefetched into the in-memory
+# cache (feeds carry ~15 entries and the baseline check screens anything
+# older, so ancient rows can never resurface). Retention deletes are off
+# by default; set a day count to actually trim the table.
+SEEN_PREFETCH_DAYS = int(os.getenv("SEEN_PREFETCH_DAYS", "60"))
+SEEN_RETENTION_DAYS = int(os.getenv("SEEN_RETENTION_DAYS", "0"))
+# Ceiling on caption fetches across all worker threads (0 disables). The
+# parallel prefetch plus concurrent channels can otherwise burst hard
+# enough to trip YouTube's bot checks.
+TRANSCRIPT_CALLS_PER_MINUTE = float(os.getenv("TRANSCRIPT_CALLS_PER_MINUTE", "30"))
+# Abort caption downloads past this size; legit tracks are well under it.
+MAX_CAPTION_BYTES = int(os.getenv("MAX_CAPTION_BYTES", str(8 * 1024 * 1024)))
+# Optional: cache fetched transcripts in Redis so restarts and retries
+# don't re-download from YouTube. Off when unset.
+REDIS_URL = os.getenv("REDIS_URL")
+# Optional WebSub push: when set to the public URL of the web tier's
+# /websub/callback route, the worker subscribes each channel to
+# YouTube's hub and processes channels on push instead of waiting for
+# the next poll. Polling stays on as a safety net, just less often.
+WEBSUB_CALLBACK_URL = os.getenv("WEBSUB_CALLBACK_URL")
+WEBSUB_LEASE_SECONDS = int(os.getenv("WEBSUB_LEASE_SECONDS", str(4 * 86400)))
 
 def dlog(*args):
     if DEBUG:
@@ -61,12 +108,16 @@ def dlog(*args):
 def log(*args):
     print("[worker]", *args, flush=True)
 
+# Prefer the libyaml C loader when the wheel ships it; the pure-Python
+# parser is an order of magnitude slower on the feeds file.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def _load_config():
     last_err = None
     for path in DEFAULT_FEEDS_PATHS:
         try:
             with open(path, "r", encoding="utf-8") as f:
-                cfg = yaml.safe_load(f) or {}
+                cfg = yaml.load(f, Loader=_YAML_LOADER) or {}
                 dlog("loaded config from", path)
                 return cfg
         except Exception as e:
@@ -78,6 +129,13 @@ CONFIG = _load_config()
 
 POST_CHAR_LIMIT = int(CONFIG.get("post_char_limit", 300))
 KEYWORDS = [k.lower() for k in CONFIG.get("keywords_positive", [])]
+# Single compiled alternation: one C-level scan per segment instead of a
+# Python loop over every keyword. An empty keyword list would compile to a
+# match-everything pattern, so guard with a never-matching one instead.
+if KEYWORDS:
+    KW_RE = re.compile("|".join(re.escape(k) for k in KEYWORDS), re.IGNORECASE)
+else:
+    KW_RE = re.compile(r"(?!)")
 EXCLUDE_NOTE = CONFIG.get("exclude_note", "")
 
 dlog("config keys:", list(CONFIG.keys()))
@@ -88,15 +146,63 @@ dlog(
 )
 
 # ---------------- DB helpers ----------------
-conn = psycopg2.connect(DB_URL)
-conn.autocommit = True
+# Channels are processed on worker threads; psycopg2 connections aren't
+# thread-safe, so each db_exec borrows a connection from a shared pool.
+POOL = ThreadedConnectionPool(2, 16, DB_URL)
 
 def db_exec(sql, args=None):
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute(sql, args or [])
-        if cur.description:
-            return cur.fetchall()
-        return []
+    conn = POOL.getconn()
+    try:
+        conn.autocommit = True
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(sql, args or [])
+            if cur.description:
+                return cur.fetchall()
+            return []
+    finally:
+        POOL.putconn(conn)
+
+# The two single-row statements that still run per event are PREPAREd
+# once per pooled connection so later executions skip parse + plan.
+# psycopg2 connections don't take new attributes, so prepared state is
+# tracked by id(conn); connections live as long as the pool does.
+_PREPARED_SQL = {
+    "st_upsert": (
+        "insert into state(key, value) values($1, $2) "
+        "on conflict (key) do update set value = excluded.value"
+    ),
+    "seen_insert": (
+        "insert into seen_episodes(feed_url, rss_guid, spotify_episode_id, published_at, transcript_zstd) "
+        "values($1, $2, $3, $4, $5) on conflict do nothing"
+    ),
+}
+_PREPARED_CONNS: set[int] = set()
+_PREPARED_LOCK = threading.Lock()
+
+def _prepare_all(cur):
+    for name, sql in _PREPARED_SQL.items():
+        cur.execute(f"prepare {name} as {sql}")
+
+def db_exec_prepared(name: str, args):
+    conn = POOL.getconn()
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            with _PREPARED_LOCK:
+                fresh = id(conn) not in _PREPARED_CONNS
+                if fresh:
+                    _PREPARED_CONNS.add(id(conn))
+            if fresh:
+                _prepare_all(cur)
+            placeholders = ", ".join(["%s"] * len(args))
+            try:
+                cur.execute(f"execute {name} ({placeholders})", args)
+            except psycopg2.errors.InvalidSqlStatementName:
+                # Pool replaced a dead connection whose id() got reused.
+                _prepare_all(cur)
+                cur.execute(f"execute {name} ({placeholders})", args)
+    finally:
+        POOL.putconn(conn)
 
 def ensure_schema():
     # state table
@@ -128,33 +234,145 @@ def ensure_schema():
         coalesce(spotify_episode_id, '')
       );
     """)
+
+    # Supports the recency-bounded cache prefetch and retention deletes.
+    db_exec("""
+    create index if not exists idx_seen_first_seen_at
+      on seen_episodes (first_seen_at);
+    """)
+
+    # Fetched transcripts are kept compressed alongside the seen row so a
+    # keyword/prompt change can re-rank old videos without re-hitting
+    # YouTube.
+    db_exec("""
+    alter table seen_episodes add column if not exists transcript_zstd bytea;
+    """)
 ensure_schema()
 
+def get_state(key: str):
+    rows = db_exec("select value from state where key=%s", [key])
+    return rows[0]["value"] if rows else None
+
+def set_state(key: str, value: str):
+    db_exec_prepared("st_upsert", [key, value])
+
 # ---------------- Baseline helpers ----------------
-def _baseline_key(feed_url: str) -> str:
-    h = hashlib.sha1(feed_url.encode("utf-8")).hexdigest()
-    return f"feed_baseline:{h}"
+def _state_key(prefix: str, feed_url: str) -> str:
+    # Raw URL as the key suffix: state.key only needs to be unique, the
+    # primary-key index handles long keys fine, and skipping the hash
+    # keeps rows greppable in psql.
+    return f"{prefix}:{feed_url}"
 
-def get_feed_baseline(feed_url: str):
-    rows = db_exec("select value from state where key=%s", [_baseline_key(feed_url)])
-    if rows:
+def _baseline_key(feed_url: str) -> str:
+    return _state_key("feed_baseline", feed_url)
+
+def _legacy_state_keys(prefix: str, feed_url: str) -> list[str]:
+    # Earlier deployments hashed the URL into the key — blake2b most
+    # recently, SHA-1 for the oldest baselines. Only used by the one-time
+    # startup migration.
+    enc = feed_url.encode("utf-8")
+    keys = [f"{prefix}:{hashlib.blake2b(enc, digest_size=10).hexdigest()}"]
+    if prefix == "feed_baseline":
+        keys.append(f"{prefix}:{hashlib.sha1(enc).hexdigest()}")
+    return keys
+
+# Baselines only change when this process writes them, so keep them in a
+# dict loaded once at startup instead of one SELECT per feed per poll.
+_BASELINE_CACHE: dict[str, datetime] = {}
+
+def _load_baselines():
+    rows = db_exec("select key, value from state where key like 'feed_baseline:%%'")
+    for r in rows:
         try:
-            return dtparse.isoparse(rows[0]["value"])
+            _BASELINE_CACHE[r["key"]] = dtparse.isoparse(r["value"])
         except Exception:
-            return None
-    return None
+            continue
+    dlog("baseline cache loaded:", len(_BASELINE_CACHE), "entries")
+
+def get_feed_baseline(feed_url: str):
+    return _BASELINE_CACHE.get(_baseline_key(feed_url))
 
 def set_feed_baseline(feed_url: str, dt_utc: datetime):
+    dt_utc = dt_utc.astimezone(UTC)
     db_exec(
         "insert into state(key, value) values(%s, %s) "
         "on conflict (key) do update set value = excluded.value",
-        [_baseline_key(feed_url), dt_utc.astimezone(UTC).isoformat()],
+        [_baseline_key(feed_url), dt_utc.isoformat()],
     )
+    _BASELINE_CACHE[_baseline_key(feed_url)] = dt_utc
 
 # ---------------- YouTube helpers ----------------
 def yt_channel_feed_url(channel_id: str) -> str:
     return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
 
+def _migrate_state_keys():
+    # One-time move of hash-keyed state rows onto the raw-URL keys above.
+    # Runs per configured feed; no-op once everything is migrated.
+    rows = {
+        r["key"]: r["value"]
+        for r in db_exec(
+            "select key, value from state where key like 'feed_baseline:%%' "
+            "or key like 'feed_etag:%%' or key like 'feed_lastmod:%%'"
+        )
+    }
+    moved = 0
+    for mode in ("national", "blazers"):
+        for f in CONFIG.get(f"{mode}_feeds", []):
+            cid = f.get("youtube_channel_id")
+            if not cid:
+                continue
+            feed_url = yt_channel_feed_url(cid)
+            for prefix in ("feed_baseline", "feed_etag", "feed_lastmod"):
+                new_key = _state_key(prefix, feed_url)
+                if new_key in rows:
+                    continue
+                for old_key in _legacy_state_keys(prefix, feed_url):
+                    if old_key in rows:
+                        set_state(new_key, rows[old_key])
+                        db_exec("delete from state where key=%s", [old_key])
+                        moved += 1
+                        break
+    if moved:
+        log("migrated", moved, "hash-keyed state rows to URL keys")
+_migrate_state_keys()
+_load_baselines()
+
+# YouTube channel feeds follow one fixed Atom schema, so skip
+# feedparser's format-sniffing generic parser and pull the handful of
+# fields each entry needs with lxml directly. Output dicts carry the
+# same keys the rest of the code already reads off feedparser entries.
+_ATOM_NS = {
+    "a": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+    "media": "http://search.yahoo.com/mrss/",
+}
+
+def _parse_channel_feed(content: bytes) -> list[dict]:
+    try:
+        root = etree.fromstring(content)
+    except Exception as e:
+        # Malformed body — let feedparser's forgiving parser have a go.
+        dlog("lxml feed parse failed; falling back to feedparser:", e)
+        return list(feedparser.parse(content).entries)
+    entries = []
+    for el in root.iterfind("a:entry", _ATOM_NS):
+        def _text(path):
+            node = el.find(path, _ATOM_NS)
+            return node.text if node is not None else None
+        link = el.find("a:link", _ATOM_NS)
+        entries.append({
+            "id": _text("a:id"),
+            "yt_videoid": _text("yt:videoId"),
+            "title": _text("a:title"),
+            "link": link.get("href") if link is not None else None,
+            "published": _text("a:published"),
+            "summary": _text("media:group/media:description"),
+        })
+    return entries
+
+_VID_ID_TAIL = re.compile(r'[:/](?P<vid>[A-Za-z0-9_-]{6,})$')
+_VID_V_PARAM = re.compile(r'[?&]v=([A-Za-z0-9_-]{6,})')
+
 def parse_youtube_video_id(entry) -> str | None:
     """
     Try multiple places to robustly extract a video ID from a YouTube channel RSS entry.
@@ -162,155 +380,37 @@ def parse_youtube_video_id(entry) -> str | None:
     vid = entry.get("yt_videoid")
     if vid:
         return vid
-    eid = entry.get("id") or ""
-    m = re.search(r'[:/](?P<vid>[A-Za-z0-9_-]{6,})$', eid)
+    m = _VID_ID_TAIL.search(entry.get("id") or "")
     if m:
         return m.group("vid")
-    link = entry.get("link") or ""
-    m = re.search(r'[?&]v=([A-Za-z0-9_-]{6,})', link)
+    m = _VID_V_PARAM.search(entry.get("link") or "")
     if m:
         return m.group(1)
     return None
 
-def _parse_vtt_to_segments(vtt_text: str):
-    """
-    Very small VTT parser -> [(start, dur, text), ...]
-    Accepts HH:MM:SS.mmm or MM:SS.mmm; commas or dots for millis.
-    """
-    def _to_seconds(ts: str) -> float:
-        ts = ts.strip().replace(',', '.')
-        parts = ts.split(':')
-        if len(parts) == 3:
-            h, m, s = parts
-            return int(h) * 3600 + int(m) * 60 + float(s)
-        elif len(parts) == 2:
-            m, s = parts
-            return int(m) * 60 + float(s)
-        return float(ts)
-
-    segs = []
-    lines = [ln.rstrip('\r') for ln in vtt_text.splitlines()]
-    i = 0
-    while i < len(lines):
-        ln = lines[i].strip()
-        i += 1
-        if not ln or ln.upper().startswith('WEBVTT') or ln.startswith('NOTE'):
-            continue
-        # Optional cue id line (numeric or text); next should be timecode
-        time_line = ln
-        if '-->' not in time_line and i < len(lines):
-            time_line = lines[i].strip()
-            i += 1
-        if '-->' not in time_line:
-            continue
-        try:
-            start_s, end_s = [p.strip() for p in time_line.split('-->')[:2]]
-            start = _to_seconds(start_s)
-            end = _to_seconds(end_s)
-        except Exception:
-            continue
-        # collect cue text until blank line
-        texts = []
-        while i < len(lines) and lines[i].strip():
-            texts.append(lines[i].strip())
-            i += 1
-        # skip blank separator
-        while i < len(lines) and not lines[i].strip():
-            i += 1
-        cue = ' '.join(texts).strip()
-        if cue:
-            segs.append((start, max(0.0, end - start), cue))
-    return segs
-
-def _parse_json3_to_segments(json_text: str):
-    """
-    Parse YouTube 'json3' captions (srv3) => [(start, dur, text), ...]
-    """
-    data = json.loads(json_text)
-    segs = []
-    for ev in data.get('events', []):
-        seg_list = ev.get('segs')
-        if not seg_list:
-            continue
-        text = ''.join(seg.get('utf8', '') for seg in seg_list).strip()
-        if not text:
-            continue
-        start = float(ev.get('tStartMs', 0)) / 1000.0
-        dur = float(ev.get('dDurationMs', 0)) / 1000.0 if ev.get('dDurationMs') is not None else 0.0
-        segs.append((start, dur, text))
-    return segs
-
-def _fallback_transcript_via_ytdlp(video_id: str):
+@dataclass
+class Segments:
     """
-    Fetch subtitles (manual or auto) using yt-dlp without downloading the video.
-    Prefer English and .vtt or json3 tracks.
+    Transcript segments as parallel arrays (structure-of-arrays): keyword
+    scans walk texts/starts without materializing a dict per segment.
+    Numeric fields are packed float32 arrays — contiguous for bisect and
+    roughly a quarter the footprint of a list of Python floats.
     """
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    # no download; quiet output
-    ydl_opts = {
-        'quiet': True,
-        'skip_download': True,
-        # No need to write files; we’ll fetch the caption URL ourselves
-    }
-    with YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=False)
+    starts: array
+    durs: array
+    texts: list
 
-    # Both keys may exist; prefer authored subs over auto
-    tracks_by_lang = {}
-    subs = info.get('subtitles') or {}
-    autos = info.get('automatic_captions') or {}
+    def __len__(self):
+        return len(self.texts)
 
-    for lang in ['en', 'en-US', 'en-GB']:
-        if lang in subs:
-            tracks_by_lang[lang] = subs[lang]
-        elif lang in autos:
-            tracks_by_lang[lang] = autos[lang]
-
-    if not tracks_by_lang:
-        raise NoTranscriptFound("yt-dlp: no English subtitles or auto-captions found")
-
-    # Choose one URL, preferring json3 or vtt
-    fmt_order = ['json3', 'vtt', 'ttml', 'srv3', 'srv2', 'srv1']
-    chosen = None
-    chosen_ext = None
-    for lang, lst in tracks_by_lang.items():
-        # Each item has {'ext': 'vtt'|'json3'|..., 'url': '...'}
-        lst_sorted = sorted(
-            lst,
-            key=lambda x: fmt_order.index(x.get('ext', 'vtt')) if x.get('ext') in fmt_order else 99
-        )
-        if lst_sorted:
-            chosen = lst_sorted[0].get('url')
-            chosen_ext = lst_sorted[0].get('ext')
-            break
-
-    if not chosen:
-        raise NoTranscriptFound("yt-dlp: could not choose a captions URL")
-
-    # Download the caption file itself (tiny)
-    with YoutubeDL({'quiet': True}) as ydl:
-        data = ydl.urlopen(chosen).read()
-
-    text = data.decode('utf-8', 'ignore')
-    if chosen_ext == 'json3':
-        segs = _parse_json3_to_segments(text)
-    else:
-        # treat vtt/ttml/srvN roughly as VTT; VTT works for most YouTube caption URLs
-        segs = _parse_vtt_to_segments(text)
-
-    if not segs:
-        raise NoTranscriptFound("yt-dlp: parsed 0 segments")
-
-    full_text = ' '.join(t for (_, _, t) in segs if t)
-    return full_text, segs
-
-def _parse_json3_to_segments(text: str):
+def _parse_json3_to_segments(text):
+    # orjson takes str or bytes, so callers can pass raw response bytes
     try:
-        data = json.loads(text)
+        data = orjson.loads(text)
     except Exception as e:
         log("json3 parse error", e)
-        return []
-    segs = []
+        return Segments(array("f"), array("f"), [])
+    starts, durs, texts = array("f"), array("f"), []
     for ev in data.get("events", []):
         seglist = ev.get("segs")
         if not seglist:
@@ -318,55 +418,42 @@ def _parse_json3_to_segments(text: str):
         t = "".join(s.get("utf8", "") for s in seglist).strip()
         if not t:
             continue
-        start = float(ev.get("tStartMs", 0)) / 1000.0
-        dur = float(ev.get("dDurationMs", 0)) / 1000.0
-        segs.append((start, dur, t))
-    return segs
+        starts.append(float(ev.get("tStartMs", 0)) / 1000.0)
+        durs.append(float(ev.get("dDurationMs", 0)) / 1000.0)
+        texts.append(t)
+    return Segments(starts, durs, texts)
+
+# One C-level pass over the whole VTT body: timecode line plus cue text up
+# to the next blank line. Commas accepted for millis (SRT-style exports).
+_VTT_CUE_RE = re.compile(
+    r"(?P<start>(?:\d+:\d{2}:\d{2}|\d{1,2}:\d{2})[.,]\d+)\s*-->\s*"
+    r"(?P<end>(?:\d+:\d{2}:\d{2}|\d{1,2}:\d{2})[.,]\d+)[^\n]*\n"
+    r"(?P<text>.*?)(?=\n\s*\n|\Z)",
+    re.DOTALL,
+)
+_VTT_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+def _vtt_ts_to_sec(ts: str) -> float:
+    parts = ts.replace(",", ".").split(":")
+    if len(parts) == 3:
+        h, m, sf = parts
+        return int(h) * 3600 + int(m) * 60 + float(sf)
+    m, sf = parts
+    return int(m) * 60 + float(sf)
 
 def _parse_vtt_to_segments(text: str):
-    segs = []
-    # Split on blank lines (blocks)
-    for block in re.split(r"\n\n+", text.strip()):
-        lines = [ln for ln in block.strip().splitlines() if ln.strip()]
-        if not lines:
-            continue
-        if lines[0].strip().upper() == "WEBVTT":
-            # drop header line
-            lines = lines[1:]
-            if not lines:
-                continue
-        # find time line
-        time_line = None
-        for ln in lines:
-            if "-->" in ln:
-                time_line = ln
-                break
-        if not time_line:
-            continue
-        m = re.search(
-            r"(?P<start>\d+:\d{2}:\d{2}\.\d+|\d{1,2}:\d{2}\.\d+)\s*-->\s*(?P<end>\d+:\d{2}:\d{2}\.\d+|\d{1,2}:\d{2}\.\d+)",
-            time_line,
-        )
-        if not m:
-            continue
-        def _to_sec(s: str) -> float:
-            parts = s.split(":")
-            if len(parts) == 3:
-                h, m, sf = parts
-                return int(h) * 3600 + int(m) * 60 + float(sf)
-            m, sf = parts
-            return int(m) * 60 + float(sf)
-        start = _to_sec(m.group("start"))
-        end = _to_sec(m.group("end"))
-        # everything after the time line is text
-        start_idx = lines.index(time_line) + 1
-        txt = " ".join(lines[start_idx:]).strip()
+    starts, durs, texts = array("f"), array("f"), []
+    for m in _VTT_CUE_RE.finditer(text):
+        txt = _WS_RE.sub(" ", _VTT_TAG_RE.sub("", m.group("text"))).strip()
         if not txt:
             continue
-        txt = re.sub(r"<[^>]+>", "", txt)      # remove tags
-        txt = re.sub(r"\s+", " ", txt).strip() # collapse spaces
-        segs.append((start, max(0.0, end - start), txt))
-    return segs
+        start = _vtt_ts_to_sec(m.group("start"))
+        end = _vtt_ts_to_sec(m.group("end"))
+        starts.append(start)
+        durs.append(max(0.0, end - start))
+        texts.append(txt)
+    return Segments(starts, durs, texts)
 
 def _fallback_transcript_via_ytdlp(video_id: str):
     """
@@ -409,35 +496,127 @@ def _fallback_transcript_via_ytdlp(video_id: str):
     if not chosen_url:
         raise NoTranscriptFound("yt-dlp: could not choose captions URL")
 
-    with YoutubeDL({"quiet": True}) as ydl:
-        data = ydl.urlopen(chosen_url).read()
-    body = data.decode("utf-8", "ignore")
+    # Fetch the caption body over the pooled session instead of a fresh
+    # yt-dlp urlopen connection. Stream with a byte cap so a broken or
+    # hostile response can't balloon memory.
+    resp = SESSION.get(chosen_url, stream=True, timeout=30)
+    resp.raise_for_status()
+    chunks, total = [], 0
+    for chunk in resp.iter_content(65536):
+        total += len(chunk)
+        if total > MAX_CAPTION_BYTES:
+            resp.close()
+            raise NoTranscriptFound(f"yt-dlp: caption body over {MAX_CAPTION_BYTES} bytes")
+        chunks.append(chunk)
+    body = b"".join(chunks)
 
     if chosen_ext == "json3":
+        # skip the str decode; orjson handles the raw bytes
         segs = _parse_json3_to_segments(body)
     else:
-        segs = _parse_vtt_to_segments(body)
+        segs = _parse_vtt_to_segments(body.decode("utf-8", "ignore"))
     if not segs:
         raise NoTranscriptFound("yt-dlp: parsed 0 segments")
 
-    full_text = " ".join(t for (_, _, t) in segs if t)
+    full_text = " ".join(t for t in segs.texts if t)
+    return full_text, segs
+
+class _TokenBucket:
+    """
+    Minimal thread-safe token bucket: take() blocks until a token is
+    available, refilling at `rate` tokens/second up to `burst`.
+    """
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+_TRANSCRIPT_BUCKET = (
+    _TokenBucket(TRANSCRIPT_CALLS_PER_MINUTE / 60.0, burst=4.0)
+    if TRANSCRIPT_CALLS_PER_MINUTE > 0
+    else None
+)
+
+# Transcript cache: a transcript for a given video id never changes, so a
+# hit skips both the network fetch and the parse. Negative results are
+# cached briefly too — a video with captions disabled would otherwise be
+# re-fetched on every encounter until it falls behind the baseline.
+_REDIS = redis.Redis.from_url(REDIS_URL) if REDIS_URL else None
+_TR_CACHE_TTL = 7 * 86400
+_TR_NEG_TTL = 6 * 3600
+_TR_NEG = b"\x00"  # sentinel blob marking a known-missing transcript
+
+def get_transcript_text(video_id: str) -> tuple[str, Segments]:
+    if _REDIS is None:
+        return _get_transcript_uncached(video_id)
+    key = f"yt:tr:{video_id}"
+    try:
+        blob = _REDIS.get(key)
+    except Exception as e:
+        dlog("redis get failed:", e)
+        blob = None
+    if blob == _TR_NEG:
+        raise NoTranscriptFound(f"cached: no transcript for {video_id}")
+    if blob:
+        return pickle.loads(zlib.decompress(blob))
+    try:
+        full_text, segs = _get_transcript_uncached(video_id)
+    except (NoTranscriptFound, TranscriptsDisabled):
+        try:
+            _REDIS.setex(key, _TR_NEG_TTL, _TR_NEG)
+        except Exception as e:
+            dlog("redis setex failed:", e)
+        raise
+    try:
+        _REDIS.setex(key, _TR_CACHE_TTL, zlib.compress(pickle.dumps((full_text, segs)), 3))
+    except Exception as e:
+        dlog("redis setex failed:", e)
     return full_text, segs
 
-def get_transcript_text(video_id: str) -> tuple[str, list]:
+# Retry transient fetch failures (YouTube 429s, flaky TLS) with backoff
+# and jitter instead of failing the video and re-hammering next poll.
+# Missing/disabled captions are permanent — never retried.
+@retry(
+    retry=retry_if_not_exception_type(
+        (NoTranscriptFound, TranscriptsDisabled, CouldNotRetrieveTranscript)
+    ),
+    wait=wait_exponential_jitter(initial=2, max=60),
+    stop=stop_after_attempt(4),
+    reraise=True,
+)
+def _get_transcript_uncached(video_id: str) -> tuple[str, Segments]:
     """
     Primary: youtube-transcript-api (no API key).
     Fallback: yt-dlp subtitles (Android client + small sleeps; optional cookies).
-    Returns (full_text, segments) or raises NoTranscriptFound / TranscriptsDisabled.
+    Returns (full_text, Segments) or raises NoTranscriptFound /
+    TranscriptsDisabled.
     """
+    if _TRANSCRIPT_BUCKET is not None:
+        _TRANSCRIPT_BUCKET.take()
     try:
         transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=["en", "en-US", "en-GB"])
-        segs = [
-            (float(t.get("start", 0.0)), float(t.get("duration", 0.0)), t.get("text", "").strip())
-            for t in transcript
-        ]
-        full_text = " ".join(s[2] for s in segs if s[2])
+        starts, durs, texts = array("f"), array("f"), []
+        for t in transcript:
+            starts.append(float(t.get("start", 0.0)))
+            durs.append(float(t.get("duration", 0.0)))
+            texts.append((t.get("text") or "").strip())
+        full_text = " ".join(t for t in texts if t)
         if full_text:
-            return full_text, segs
+            return full_text, Segments(starts, durs, texts)
     except (NoTranscriptFound, TranscriptsDisabled, CouldNotRetrieveTranscript) as e:
         log("youtube-transcript-api says no transcript; trying yt-dlp fallback:", video_id, str(e))
     except Exception as e:
@@ -447,34 +626,70 @@ def get_transcript_text(video_id: str) -> tuple[str, list]:
     # Fallback via yt-dlp (no video download)
     return _fallback_transcript_via_ytdlp(video_id)
 
+def _fetch_transcript(video_id: str):
+    """
+    Fetch wrapper that folds the exception cases into a status tuple so the
+    fetch can run on a worker thread and be consumed later.
+    """
+    try:
+        return ("ok", get_transcript_text(video_id))
+    except (NoTranscriptFound, TranscriptsDisabled, CouldNotRetrieveTranscript) as e:
+        return ("none", e)
+    except Exception as e:
+        return ("err", e)
+
 def fmt_mmss(seconds: int) -> str:
     m = seconds // 60
     s = seconds % 60
     return f"{int(m):02d}:{int(s):02d}"
 
 def clamp(text, limit=POST_CHAR_LIMIT):
+    # default binds once at def time; the f-string builds the truncated
+    # result in one allocation instead of slice-then-concatenate
     if len(text) <= limit:
         return text
-    return text[:limit-1] + "…"
+    return f"{text[:limit-1]}…"
 
-def first_keyword_hit(segs: list) -> tuple[int | None, str | None]:
+def title_precheck_passes(entry, mode: str) -> bool:
+    """
+    National shows rarely mention the Blazers, but every video still paid a
+    multi-MB caption download before the keyword check said no. Check the
+    cheap RSS title + description first and skip the fetch on a miss.
+    """
+    if mode != "national" or not NATIONAL_TITLE_PRECHECK:
+        return True
+    blob = f"{entry.get('title') or ''} {entry.get('summary') or ''}"
+    return KW_RE.search(blob) is not None
+
+def first_keyword_hit(segs: Segments) -> tuple[int | None, str | None]:
     """
     Find first segment that contains any of the target keywords.
     Returns (start_seconds, matched_text) or (None, None).
     """
-    for (start, dur, text) in segs:
-        low = text.lower()
-        if any(k in low for k in KEYWORDS):
-            return int(math.floor(start)), text
+    for i, text in enumerate(segs.texts):
+        if KW_RE.search(text):
+            return int(math.floor(segs.starts[i])), text
     return None, None
 
+# ---------------- HTTP session ----------------
+# One pooled session for all outbound HTTP so repeated calls to the same
+# hosts reuse sockets instead of paying TCP+TLS setup every time.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504)),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
 # ---------------- Posting ----------------
 def create_thread(first_text, second_text):
     payload = {"firstText": first_text, "secondText": second_text}
-    r = requests.post(
+    r = SESSION.post(
         f"{WEB_BASE_URL}/post-thread",
-        headers={"Content-Type": "application/json", "X-Internal-Token": INTERNAL_API_TOKEN},
-        data=json.dumps(payload),
+        headers={"X-Internal-Token": INTERNAL_API_TOKEN},
+        json=payload,
         timeout=60,
     )
     if r.status_code != 200:
@@ -483,20 +698,87 @@ def create_thread(first_text, second_text):
         log("posted thread ok")
 
 # ---------------- Dedupe ----------------
-def already_seen(feed_url, guid, media_id):
+# Seen episodes never un-seen themselves and only this worker writes them,
+# so the whole set lives in memory: prefetched once at startup, updated on
+# every mark. DB inserts stay ON CONFLICT DO NOTHING for crash safety.
+_SEEN_CACHE: set[tuple] = set()
+
+def _load_seen():
+    # Bound the prefetch: rows older than the window can't reappear in a
+    # feed (the baseline pubdate check rejects them first), so there is no
+    # point holding the whole table in memory forever.
     rows = db_exec(
-        "select 1 from seen_episodes "
-        "where feed_url=%s and coalesce(rss_guid,'')=coalesce(%s,'') and coalesce(spotify_episode_id,'')=coalesce(%s,'')",
-        [feed_url, guid, media_id],
+        "select feed_url, rss_guid, spotify_episode_id from seen_episodes "
+        "where first_seen_at > now() - make_interval(days => %s)",
+        [SEEN_PREFETCH_DAYS],
     )
-    return bool(rows)
+    for r in rows:
+        _SEEN_CACHE.add((r["feed_url"], r["rss_guid"] or "", r["spotify_episode_id"] or ""))
+    dlog("seen cache loaded:", len(_SEEN_CACHE), "entries")
 
-def mark_seen(feed_url, guid, media_id, published_at):
+def _trim_seen():
+    if SEEN_RETENTION_DAYS <= 0:
+        return
     db_exec(
-        "insert into seen_episodes(feed_url, rss_guid, spotify_episode_id, published_at) "
-        "values(%s, %s, %s, %s) on conflict do nothing",
-        [feed_url, guid, media_id, published_at],
+        "delete from seen_episodes where first_seen_at < now() - make_interval(days => %s)",
+        [SEEN_RETENTION_DAYS],
     )
+_trim_seen()
+_load_seen()
+
+def _explain_seen_lookup():
+    # The coalesce() form below matches the uq_seen expression index
+    # exactly; surface the plan in DEBUG so an index regression (e.g. after
+    # a schema edit) shows up as a seq scan in the logs instead of silent
+    # slowdown as the table grows.
+    try:
+        rows = db_exec(
+            "explain select 1 from seen_episodes "
+            "where feed_url=%s and coalesce(rss_guid,'')=coalesce(%s,'') "
+            "and coalesce(spotify_episode_id,'')=coalesce(%s,'')",
+            ["https://example.invalid/feed", "guid", "vid"],
+        )
+        for r in rows:
+            dlog("seen lookup plan:", r["QUERY PLAN"])
+    except Exception as e:
+        dlog("explain failed:", e)
+if DEBUG:
+    _explain_seen_lookup()
+
+def already_seen(feed_url, guid, media_id):
+    return (feed_url, guid or "", media_id or "") in _SEEN_CACHE
+
+def _compress_transcript(full_text: str) -> bytes:
+    # Level 9 lands around 4-5x on English prose; compressor contexts
+    # aren't thread-safe, so build one per call.
+    return zstandard.ZstdCompressor(level=9).compress(full_text.encode("utf-8"))
+
+def mark_seen(feed_url, guid, media_id, published_at, transcript_zstd=None):
+    db_exec_prepared("seen_insert", [feed_url, guid, media_id, published_at, transcript_zstd])
+    _SEEN_CACHE.add((feed_url, guid or "", media_id or ""))
+
+def mark_seen_many(rows):
+    """
+    Flush a channel batch of (feed_url, guid, media_id, published_at,
+    transcript_zstd) rows in one statement instead of one INSERT
+    round-trip per video.
+    """
+    if not rows:
+        return
+    conn = POOL.getconn()
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            execute_values(
+                cur,
+                "insert into seen_episodes(feed_url, rss_guid, spotify_episode_id, published_at, transcript_zstd) "
+                "values %s on conflict do nothing",
+                rows,
+            )
+    finally:
+        POOL.putconn(conn)
+    for feed_url, guid, media_id, _pub, _tz in rows:
+        _SEEN_CACHE.add((feed_url, guid or "", media_id or ""))
 
 # ---------------- Gemini ----------------
 # Per https://ai.google.dev/gemini-api/docs/api-key
@@ -509,52 +791,185 @@ ai = genai.Client(api_key=GEMINI_KEY)
 # Optional, non-secret log (no key content):
 log("Gemini API key detected via", "GOOGLE_API_KEY" if os.getenv("GOOGLE_API_KEY") else "GEMINI_API_KEY")
 
-def gemini_json(prompt, text):
+GEMINI_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "is_blazers": {"type": "boolean"},
+        "topic": {"type": "string"},
+        "summary": {"type": "string"},
+    },
+    "required": ["is_blazers"],
+}
+
+# Config objects are immutable request-shaping values; build them once at
+# import instead of re-validating the pydantic models on every call. The
+# judging instructions ride along as system_instruction so each request
+# body carries only the snippet text.
+GEMINI_PROMPT = (
+    "You will be given a snippet from a podcast transcript. "
+    "Decide if it is about the NBA team the Portland Trail Blazers (players, coaches, front office). "
+    "Exclude any generic 'trailblazer' usages not about the NBA team. "
+    f"{EXCLUDE_NOTE}\n\n"
+    "Return JSON with fields: is_blazers (boolean), topic (short string), summary (<=300 chars, neutral tone)."
+)
+GEMINI_CONFIG = gtypes.GenerateContentConfig(
+    system_instruction=GEMINI_PROMPT,
+    response_mime_type="application/json",
+    response_schema=GEMINI_SCHEMA,
+    thinking_config=gtypes.ThinkingConfig(thinking_budget=0),
+)
+GEMINI_BATCH_CONFIG = gtypes.GenerateContentConfig(
+    system_instruction=(
+        GEMINI_PROMPT
+        + "\n\nYou will be given several numbered snippets. "
+          "Return a JSON array with exactly one object per snippet, in the same order."
+    ),
+    response_mime_type="application/json",
+    response_schema={"type": "array", "items": GEMINI_SCHEMA},
+    thinking_config=gtypes.ThinkingConfig(thinking_budget=0),
+)
+
+# Gemini rate limits surface as APIError (429/5xx); back off and retry
+# rather than dropping the candidate until the next poll.
+_GEMINI_RETRY = retry(
+    retry=retry_if_exception_type(gerrors.APIError),
+    wait=wait_exponential_jitter(initial=2, max=60),
+    stop=stop_after_attempt(4),
+    reraise=True,
+)
+
+@_GEMINI_RETRY
+def gemini_json(text):
     resp = ai.models.generate_content(
         model="gemini-2.5-flash-lite",
-        contents=[{"role": "user", "parts": [{"text": prompt + "\n\n" + text}]}],
-        config=gtypes.GenerateContentConfig(
-            response_mime_type="application/json",
-            response_schema={
-                "type": "object",
-                "properties": {
-                    "is_blazers": {"type": "boolean"},
-                    "topic": {"type": "string"},
-                    "summary": {"type": "string"},
-                },
-                "required": ["is_blazers"],
-            },
-            thinking_config=gtypes.ThinkingConfig(thinking_budget=0),
-        ),
+        contents=[{"role": "user", "parts": [{"text": text}]}],
+        config=GEMINI_CONFIG,
     )
     try:
-        return json.loads(resp.text or "{}")
+        return orjson.loads(resp.text or "{}")
     except Exception:
         return {}
 
+@_GEMINI_RETRY
+def gemini_json_batch(snippets):
+    """
+    Classify several snippets in one Gemini round-trip.
+    Returns one dict per snippet (same order). Falls back to per-snippet
+    calls if the batch response doesn't line up.
+    """
+    if len(snippets) == 1:
+        return [gemini_json(snippets[0])]
+    numbered = "\n\n".join(f"[{i}] {s}" for i, s in enumerate(snippets))
+    resp = ai.models.generate_content(
+        model="gemini-2.5-flash-lite",
+        contents=[{"role": "user", "parts": [{"text": numbered}]}],
+        config=GEMINI_BATCH_CONFIG,
+    )
+    try:
+        outs = orjson.loads(resp.text or "[]")
+    except Exception:
+        outs = None
+    if not isinstance(outs, list) or len(outs) != len(snippets):
+        log("gemini batch response mismatch; retrying per-snippet")
+        return [gemini_json(s) for s in snippets]
+    return outs
+
 # ---------------- Core processing ----------------
 def parse_pubdate(entry):
     # YouTube RSS typically has 'published' like "2025-08-22T17:11:00+00:00"
-    if "published" in entry:
-        try:
-            dt = dtparse.parse(entry["published"])
+    raw = entry.get("published")
+    if raw:
+        # Cheap parsers first: ISO-8601 covers YouTube/Atom, RFC 2822 covers
+        # plain RSS. dateutil's general parser is 10x+ slower, so it's the
+        # last resort only.
+        for parse in (
+            lambda s: datetime.fromisoformat(s.replace("Z", "+00:00")),
+            parsedate_to_datetime,
+            dtparse.parse,
+        ):
+            try:
+                dt = parse(raw)
+            except Exception:
+                continue
             if not dt.tzinfo:
                 dt = dt.replace(tzinfo=UTC)
             return dt.astimezone(UTC)
-        except Exception:
-            pass
     # Fallback: now
     return datetime.now(UTC)
 
+# One lock per channel: a WebSub push can arrive while the safety-net
+# poll is already working the same feed, and two concurrent runs would
+# both pass the seen check (the cache updates at flush time) and post
+# the same thread twice. The loser skips; the push or next sweep will
+# pick up anything it missed.
+_CHANNEL_LOCKS: dict[str, threading.Lock] = {}
+
 def process_channel(channel_id: str, mode: str):
+    lock = _CHANNEL_LOCKS.setdefault(channel_id, threading.Lock())
+    if not lock.acquire(blocking=False):
+        dlog("channel already being processed; skipping:", channel_id)
+        return
+    try:
+        _process_channel(channel_id, mode)
+    finally:
+        lock.release()
+
+def _process_channel(channel_id: str, mode: str):
     feed_url = yt_channel_feed_url(channel_id)
     try:
-        d = feedparser.parse(feed_url)
-        entries = list(d.entries)
+        # Conditional GET: send the stored ETag/Last-Modified so unchanged
+        # feeds come back as an empty 304 instead of a full XML body. The
+        # fetch goes through the pooled SESSION (feedparser's own urllib
+        # path opens a fresh TLS connection per feed) and the parsed bytes
+        # are handed to feedparser directly.
+        etag = get_state(_state_key("feed_etag", feed_url))
+        modified = get_state(_state_key("feed_lastmod", feed_url))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+        resp = SESSION.get(feed_url, headers=headers, timeout=30)
+        if resp.status_code == 304:
+            dlog("feed unchanged (304):", feed_url)
+            return
+        resp.raise_for_status()
+
+        def _save_validators():
+            # Persist the new validators only once the channel completed
+            # cleanly: storing them up front would turn every later poll
+            # into a 304 early-return, so a transiently failed video (left
+            # unmarked on purpose so it can retry) would never be retried
+            # until the channel uploads again.
+            new_etag = resp.headers.get("ETag")
+            new_modified = resp.headers.get("Last-Modified")
+            if new_etag and new_etag != etag:
+                set_state(_state_key("feed_etag", feed_url), new_etag)
+            if new_modified and new_modified != modified:
+                set_state(_state_key("feed_lastmod", feed_url), new_modified)
+
+        entries = _parse_channel_feed(resp.content)
         dlog("feed:", feed_url, "entries:", len(entries))
 
         if not entries:
             dlog("feed has 0 entries:", feed_url)
+            _save_validators()
+            return
+
+        # Quiet-feed short-circuit: most cycles every entry is one we've
+        # already marked. Video-id extraction is one dict lookup per entry
+        # and the seen check is a set lookup, so confirm there is work
+        # before paying pubdate parsing and sorting for the whole feed.
+        baseline = get_feed_baseline(feed_url)
+
+        def _entry_seen(e):
+            v = parse_youtube_video_id(e)
+            # id-less entries get skipped later anyway, so they're not work
+            return v is None or already_seen(feed_url, e.get("id") or e.get("link") or v, v)
+
+        if baseline is not None and all(_entry_seen(e) for e in entries):
+            dlog("all entries already seen:", feed_url)
+            _save_validators()
             return
 
         # Build (pub, entry, vid)
@@ -569,11 +984,11 @@ def process_channel(channel_id: str, mode: str):
 
         if not rows:
             dlog("no rows after parsing video ids")
+            _save_validators()
             return
 
         rows.sort(key=lambda t: t[0], reverse=True)
         newest_pub = rows[0][0]
-        baseline = get_feed_baseline(feed_url)
         dlog("baseline for", feed_url, "=", baseline.isoformat() if baseline else None)
         dlog("newest_pub:", newest_pub.isoformat())
 
@@ -581,8 +996,17 @@ def process_channel(channel_id: str, mode: str):
         if baseline is None:
             dlog("first run for feed; newest entry will be processed once")
             pub, entry, vid = rows[0]
-            handle_video(feed_url, mode, entry, vid)
+            marks = []
+            failures = []
+            p = handle_video(feed_url, mode, entry, vid, marks=marks, failures=failures)
+            classify_and_post([p] if p else [], marks, failures)
+            mark_seen_many(marks)
+            if failures:
+                # Leave the baseline unset and validators stale so the
+                # next poll refetches and retries this entry.
+                return
             set_feed_baseline(feed_url, pub)
+            _save_validators()
             return
 
         # Subsequent: strictly newer than baseline, oldest→newest
@@ -592,33 +1016,96 @@ def process_channel(channel_id: str, mode: str):
         if not to_process:
             dlog("no items newer than baseline for feed:", feed_url)
 
-        for pub, entry, vid in to_process[:8]:  # safety cap
-            handle_video(feed_url, mode, entry, vid)
+        batch = [
+            (pub, entry, vid)
+            for pub, entry, vid in to_process[:8]  # safety cap
+            if not already_seen(feed_url, entry.get("id") or entry.get("link") or vid, vid)
+        ]
+
+        # Caption fetches are independent network calls; prefetch them in
+        # parallel so a multi-video batch overlaps the downloads.
+        prefetched = {}
+        if len(batch) > 1:
+            with ThreadPoolExecutor(max_workers=4) as ex:
+                futs = {
+                    vid: ex.submit(_fetch_transcript, vid)
+                    for _, e, vid in batch
+                    if title_precheck_passes(e, mode)
+                }
+                prefetched = {vid: fut.result() for vid, fut in futs.items()}
+
+        pending = []
+        marks = []
+        failures = []
+        for pub, entry, vid in batch:
+            p = handle_video(feed_url, mode, entry, vid, transcript=prefetched.get(vid), marks=marks, failures=failures)
+            if p:
+                pending.append(p)
+        classify_and_post(pending, marks, failures)
+        mark_seen_many(marks)
+
+        if failures:
+            # A transiently failed item must stay strictly newer than the
+            # baseline to re-enter to_process next poll, so advance only
+            # to just below the earliest failure — and keep the old
+            # validators so that poll refetches the feed instead of
+            # 304-short-circuiting. Successfully handled items are marked
+            # seen, so re-scanning them is a cache hit, not a repost.
+            retry_from = min(failures) - timedelta(microseconds=1)
+            if retry_from > baseline:
+                set_feed_baseline(feed_url, retry_from)
+            return
 
         if newest_pub > baseline:
             set_feed_baseline(feed_url, newest_pub)
+        _save_validators()
 
     except Exception as e:
         log("channel error", channel_id, e)
 
-def handle_video(feed_url: str, mode: str, entry, video_id: str):
+def handle_video(feed_url: str, mode: str, entry, video_id: str, transcript=None, marks=None, failures=None):
     guid = entry.get("id") or entry.get("link") or video_id
     pub = parse_pubdate(entry)
     title = (entry.get("title") or "").strip()
+    tz_blob = None  # compressed transcript, once fetched
+
+    def note_seen():
+        # Accumulate into the channel batch when one was provided so the
+        # INSERTs flush together via mark_seen_many.
+        if marks is not None:
+            marks.append((feed_url, guid, video_id, pub, tz_blob))
+        else:
+            mark_seen(feed_url, guid, video_id, pub, tz_blob)
 
     if already_seen(feed_url, guid, video_id):
         dlog("skip: already_seen", guid)
         return
 
-    try:
-        full_text, segs = get_transcript_text(video_id)
-    except (NoTranscriptFound, TranscriptsDisabled, CouldNotRetrieveTranscript) as e:
-        log("no transcript", video_id, e)
-        mark_seen(feed_url, guid, video_id, pub)
+    if not title_precheck_passes(entry, mode):
+        dlog("no keyword in title/summary; skipping transcript fetch", video_id)
+        note_seen()
         return
-    except Exception as e:
-        log("transcript error", video_id, e)
-        return  # don't mark seen if we had a transient error
+
+    # Use the prefetched transcript when process_channel fetched it on the
+    # thread pool; otherwise fetch inline.
+    if transcript is None:
+        transcript = _fetch_transcript(video_id)
+    status, value = transcript
+    if status == "none":
+        log("no transcript", video_id, value)
+        note_seen()
+        return
+    if status == "err":
+        # Don't mark seen, and report the failure so _process_channel
+        # neither stores fresh validators nor moves the baseline past
+        # this video — otherwise the next polls 304-short-circuit and
+        # the "retry next poll" never happens.
+        log("transcript error", video_id, value)
+        if failures is not None:
+            failures.append(pub)
+        return
+    full_text, segs = value
+    tz_blob = _compress_transcript(full_text)
 
     # find first keyword hit to get a timestamp + local snippet
     start_sec, matched_text = first_keyword_hit(segs)
@@ -626,41 +1113,171 @@ def handle_video(feed_url: str, mode: str, entry, video_id: str):
         dlog("no direct keyword hit in transcript; mode=", mode)
         # No direct keyword hit — allow Gemini for "blazers" feeds, stricter for "national"
         if mode == "national":
-            mark_seen(feed_url, guid, video_id, pub)
+            note_seen()
             return
         snippet = full_text[:4000]
         jump = 0
     else:
         window_end = start_sec + 180  # ~3 minutes after
-        window_texts = [t for (s, dur, t) in segs if s >= start_sec and s <= window_end]
-        snippet = " ".join(window_texts)[:8000]
+        # starts are sorted, so binary-search the window bounds instead of
+        # filtering the whole transcript; stop accumulating once the
+        # snippet cap is reached rather than joining the window and
+        # truncating after.
+        lo = bisect_left(segs.starts, start_sec)
+        hi = bisect_right(segs.starts, window_end)
+        parts, size = [], 0
+        for t in segs.texts[lo:hi]:
+            parts.append(t)
+            size += len(t) + 1
+            if size >= 8000:
+                break
+        snippet = " ".join(parts)[:8000]
         jump = start_sec
 
-    # Ask Gemini to judge & summarize (strict Blazers context)
-    prompt = (
-        "You will be given a snippet from a podcast transcript. "
-        "Decide if it is about the NBA team the Portland Trail Blazers (players, coaches, front office). "
-        "Exclude any generic 'trailblazer' usages not about the NBA team. "
-        f"{EXCLUDE_NOTE}\n\n"
-        "Return JSON with fields: is_blazers (boolean), topic (short string), summary (<=300 chars, neutral tone)."
-    )
-    out = gemini_json(prompt, snippet)
-    if not out.get("is_blazers"):
-        dlog("gemini says not blazers; marking seen", video_id)
-        mark_seen(feed_url, guid, video_id, pub)
+    # Defer the Gemini judgement so process_channel can batch it
+    return {
+        "feed_url": feed_url,
+        "guid": guid,
+        "vid": video_id,
+        "pub": pub,
+        "title": title,
+        "snippet": snippet,
+        "jump": jump,
+        "tz": tz_blob,
+    }
+
+def classify_and_post(pending, marks=None, failures=None):
+    """
+    Run the Gemini judgement for a batch of candidate videos (one call per
+    channel instead of one per video), then post/mark each one. Transient
+    post failures append the item's pub to `failures` so the caller can
+    hold the baseline back and retry next poll.
+    """
+    if not pending:
         return
 
-    topic = (out.get("topic") or "Blazers").strip()
-    link = f"https://www.youtube.com/watch?v={video_id}"
-    if jump > 0:
-        link += f"&t={int(jump)}s"
+    def note_seen(p):
+        if marks is not None:
+            marks.append((p["feed_url"], p["guid"], p["vid"], p["pub"], p.get("tz")))
+        else:
+            mark_seen(p["feed_url"], p["guid"], p["vid"], p["pub"], p.get("tz"))
+    outs = gemini_json_batch([p["snippet"] for p in pending])
+    for p, out in zip(pending, outs):
+        if not out.get("is_blazers"):
+            dlog("gemini says not blazers; marking seen", p["vid"])
+            note_seen(p)
+            continue
+
+        topic = (out.get("topic") or "Blazers").strip()
+        jump = p["jump"]
+        link = f"https://www.youtube.com/watch?v={p['vid']}"
+        if jump > 0:
+            link += f"&t={int(jump)}s"
+
+        time_txt = fmt_mmss(jump) if jump > 0 else ""
+        first = clamp(f"{p['title']}{' — ' + time_txt if time_txt else ''} {topic} {link}")
+        second = clamp((out.get("summary", "") or "").strip())
+
+        try:
+            create_thread(first, second)
+        except Exception as e:
+            # Leave this item unmarked and report the failure so the
+            # caller keeps the baseline below it; keep going so one bad
+            # post doesn't abort the rest of the batch.
+            log("post failed; leaving unmarked for retry", p["vid"], e)
+            if failures is not None:
+                failures.append(p["pub"])
+            continue
+        # Posted items are marked durably right away — batching them with
+        # the cheap skips would reopen a double-post window if anything
+        # later failed before the flush.
+        mark_seen(p["feed_url"], p["guid"], p["vid"], p["pub"], p.get("tz"))
+
+# ---------------- WebSub push ----------------
+WEBSUB_HUB = "https://pubsubhubbub.appspot.com/subscribe"
+
+def _configured_jobs():
+    jobs = []
+    for mode in ("national", "blazers"):
+        for f in CONFIG.get(f"{mode}_feeds", []):
+            cid = f.get("youtube_channel_id")
+            if not cid:
+                log("skip (no youtube_channel_id)", f.get("youtube_search") or f.get("rss"))
+                continue
+            jobs.append((cid, mode))
+    return jobs
+
+# Mode lookup for push notifications, which only carry the channel id.
+_CHANNEL_MODES = dict(_configured_jobs())
 
-    time_txt = fmt_mmss(jump) if jump > 0 else ""
-    first = clamp(f"{title}{' — ' + time_txt if time_txt else ''} {topic} {link}", POST_CHAR_LIMIT)
-    second = clamp((out.get("summary", "") or "").strip(), POST_CHAR_LIMIT)
+def _websub_subscribe_all():
+    """
+    (Re)subscribe every configured channel at YouTube's hub. Leases are
+    tracked in the state table so this is a no-op for channels whose
+    lease is still comfortably valid.
+    """
+    now = datetime.now(UTC)
+    for cid in _CHANNEL_MODES:
+        feed_url = yt_channel_feed_url(cid)
+        key = _state_key("websub_lease", feed_url)
+        stored = get_state(key)
+        if stored:
+            try:
+                if dtparse.isoparse(stored) > now:
+                    continue
+            except Exception:
+                pass
+        try:
+            resp = SESSION.post(
+                WEBSUB_HUB,
+                data={
+                    "hub.mode": "subscribe",
+                    "hub.topic": feed_url,
+                    "hub.callback": WEBSUB_CALLBACK_URL,
+                    "hub.lease_seconds": str(WEBSUB_LEASE_SECONDS),
+                    # Hub signs notification bodies with this; the web
+                    # tier rejects unsigned/mis-signed POSTs.
+                    "hub.secret": INTERNAL_API_TOKEN,
+                },
+                timeout=20,
+            )
+            if resp.status_code in (202, 204):
+                # Renew at half-lease so an outage can't let it lapse.
+                renew_at = now + timedelta(seconds=WEBSUB_LEASE_SECONDS // 2)
+                set_state(key, renew_at.isoformat())
+            else:
+                log("websub subscribe failed", cid, resp.status_code, resp.text[:200])
+        except Exception as e:
+            log("websub subscribe error", cid, e)
 
-    create_thread(first, second)
-    mark_seen(feed_url, guid, video_id, pub)
+def _websub_listener():
+    """
+    Dedicated LISTEN connection: the web tier pg_notify()s the channel id
+    for each push, and the channel is processed immediately instead of at
+    the next poll.
+    """
+    while True:
+        try:
+            conn = psycopg2.connect(DB_URL)
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("listen websub_push")
+            log("websub listener ready")
+            while True:
+                if select.select([conn], [], [], 60) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    note = conn.notifies.pop(0)
+                    mode = _CHANNEL_MODES.get(note.payload)
+                    if mode is None:
+                        dlog("websub push for unconfigured channel:", note.payload)
+                        continue
+                    dlog("websub push:", note.payload)
+                    process_channel(note.payload, mode)
+        except Exception as e:
+            log("websub listener error; reconnecting in 10s:", e)
+            time.sleep(10)
 
 # ---------------- Loop ----------------
 def loop():
@@ -668,34 +1285,38 @@ def loop():
     if FORCE_ONE_SHOT:
         dlog("FORCE_ONE_SHOT enabled: will process the newest item once, then disable")
 
+    if WEBSUB_CALLBACK_URL:
+        threading.Thread(target=_websub_listener, daemon=True).start()
+
     while True:
         log("polling…")
 
-        # National shows
-        for f in CONFIG.get("national_feeds", []):
-            cid = f.get("youtube_channel_id")
-            if not cid:
-                log("skip (no youtube_channel_id)", f.get("youtube_search") or f.get("rss"))
-                continue
-            process_channel(cid, "national")
-            time.sleep(SCAN_PAUSE_SECONDS)
+        if WEBSUB_CALLBACK_URL:
+            _websub_subscribe_all()
 
-        # Blazers-specific shows
-        for f in CONFIG.get("blazers_feeds", []):
-            cid = f.get("youtube_channel_id")
-            if not cid:
-                log("skip (no youtube_channel_id)", f.get("youtube_search") or f.get("rss"))
-                continue
-            process_channel(cid, "blazers")
-            time.sleep(SCAN_PAUSE_SECONDS)
+        jobs = _configured_jobs()
+
+        # Channels are I/O-bound (feed fetch, captions, Gemini), so run them
+        # on a bounded pool. Submissions are still staggered so we don't
+        # burst-hit YouTube all at once.
+        with ThreadPoolExecutor(max_workers=FEED_WORKERS) as ex:
+            futures = []
+            for cid, mode in jobs:
+                futures.append(ex.submit(process_channel, cid, mode))
+                time.sleep(SCAN_PAUSE_SECONDS)
+            for fut in futures:
+                fut.result()
 
         # Turn off FORCE_ONE_SHOT after the first loop to avoid repeat posting
         if FORCE_ONE_SHOT:
             FORCE_ONE_SHOT = False
             dlog("FORCE_ONE_SHOT completed; set to False")
 
-        log("sleep", POLL_INTERVAL_SECONDS, "s")
-        time.sleep(POLL_INTERVAL_SECONDS)
+        # With push active, polling is only a safety net — back off to at
+        # least an hour between sweeps.
+        sleep_s = max(POLL_INTERVAL_SECONDS, 3600) if WEBSUB_CALLBACK_URL else POLL_INTERVAL_SECONDS
+        log("sleep", sleep_s, "s")
+        time.sleep(sleep_s)
 
 if __name__ == "__main__":
     loop()